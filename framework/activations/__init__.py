@@ -13,3 +13,6 @@ from framework.activations.tanh import Tanh
 # Activations grouped by how parameters are be initialized
 xavier_activations = (Sigmoid, Tanh)
 he_activations = (Relu,)
+
+# Activations that return their inputs instead of new values
+identity_activations = (Linear,)
@@ -45,7 +45,9 @@ class Relu(Activation):
         :return: The relu point derivatives of the inputs
         """
 
-        derivatives = np.where(inputs > 0, 1, self._SLOPE)
+        ones = inputs.dtype.type(1)
+        slopes = inputs.dtype.type(self._SLOPE)
+        derivatives = np.where(inputs > 0, ones, slopes)
 
         return derivatives
 
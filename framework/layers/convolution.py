@@ -26,7 +26,7 @@ def _pad(inputs: ndarray, size: int) -> ndarray:
     padded_shape = list(inputs.shape)
     padded_shape[-3] += 2 * size
     padded_shape[-2] += 2 * size
-    padded_inputs = np.zeros(padded_shape)
+    padded_inputs = np.zeros(padded_shape, inputs.dtype)
 
     # Replace the intermediate zeroes with the original data
     inputs_h = inputs.shape[-3]
@@ -58,7 +58,7 @@ def _convolve(inputs: ndarray, kernels: ndarray) -> ndarray:
     maps_shape[1] = inputs_h - (kernel_size - 1)
     maps_shape[2] = inputs_w - (kernel_size - 1)
     maps_shape[3] = channels_out
-    feature_maps = np.empty(maps_shape)
+    feature_maps = np.empty(maps_shape, np.result_type(inputs, kernels))
 
     # Convolve the inputs with the kernels
     dot_axes = 2 * ((3, 2, 1),)
@@ -153,11 +153,11 @@ class Convolution(Layer):
         scale = math.sqrt(2 / (channels_in * kernel_shape ** 2 + channels_out))
         size = (channels_out,) + 2 * (kernel_shape,) + (channels_in,)
         kernels = generator.normal(0, scale, size)
-        self.parameters['kernels']['values'] = kernels
+        self.parameters['kernels']['values'] = kernels.astype(np.float32)
 
         # Initialize the biases at zero
         size = len(inputs_shape) * (1,) + (channels_out,)
-        biases = np.zeros(size)
+        biases = np.zeros(size, np.float32)
         self.parameters['biases']['values'] = biases
 
         return True
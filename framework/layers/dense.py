@@ -50,6 +50,10 @@ class Dense(Layer):
         else:
             self._ACTIVATION = activation
 
+        # Define if the layer outputs are the linear values it retains
+        self.RETAINS_OUTPUTS = isinstance(
+            self._ACTIVATION, activations.identity_activations)
+
         # Define the parameter dictionaries and identification keys
         self.parameters = {'kernel': {}, 'bias': {}}
         self.parameters['kernel']['id'] = self.LAYER_ID + '_kernel'
@@ -85,11 +89,11 @@ class Dense(Layer):
         else:
             scale = math.sqrt(1 / units_in)
             kernel = generator.normal(0, scale, size)
-        self.parameters['kernel']['values'] = kernel
+        self.parameters['kernel']['values'] = kernel.astype(np.float32)
 
         # Initialize the bias at zero
         size = len(inputs_shape) * (1,) + (units_out,)
-        self.parameters['bias']['values'] = np.zeros(size)
+        self.parameters['bias']['values'] = np.zeros(size, np.float32)
 
         return True
 
@@ -4,6 +4,7 @@ Dropout layer for regularizing the machine learning model.
 
 __author__ = 'Dylan Warnecke'
 
+import math
 import numpy as np
 from numpy import ndarray
 from framework.layers import Layer
@@ -33,13 +34,65 @@ class Dropout(Layer):
         self.LAYER_ID = 'Dropout' + str(Dropout.layers)
 
         # Check and define the dropout rate
-        if not 0 < rate < 1:
-            raise ValueError("Dropout rate must be between 0 and 1.")
+        if not 0 <= rate < 1:
+            raise ValueError("Dropout rate must be in the interval [0, 1).")
         self._RATE = rate
 
-        # Define the dropout filter retainer and random generator
-        self._generator = np.random.default_rng()
-        self._dropout_filter = None
+        # Define the byte threshold that drops units from a random byte
+        self._THRESHOLD = np.uint8(min(max(round(rate * 256), 1), 255))
+        self._INV_KEEP = np.float32(256 / (256 - int(self._THRESHOLD)))
+
+        # Define the counter-based generator key and the training steps
+        self._KEY = np.random.SeedSequence().generate_state(2, np.uint64)
+        self._steps = 0
+
+        # Define the retainer of the step the dropout filter was drawn at
+        self._filter_step = None
+
+        # Define if training outputs overwrite the inputs instead of a buffer
+        self.in_place = False
+
+        # Define the reusable forward propagation output buffer
+        self._output_buffer = None
+
+        # Bind pass through propagation if the rate rounds to no dropped bytes
+        if round(rate * 256) == 0:
+            self.forward_train = self.forward_eval
+            self.backward = self._backward_eval
+
+    def _configure(self, input_layers: ndarray) -> bool:
+        """
+        Configure the layer output buffer to be used. Smaller batches use
+        a view of the buffer instead of reallocating it.
+        :param input_layers: The inputs the buffer must hold
+        :return: If the layer was successfully configured
+        """
+
+        # Allocate the output buffer matching the inputs shape and type
+        self._output_buffer = np.empty_like(input_layers)
+
+        return True
+
+    def _draw_filter(self, step: int, shape: tuple) -> ndarray:
+        """
+        Draw the dropout filter of a training step. The same step always
+        draws the same filter.
+        :param step: The training step to draw the filter of
+        :param shape: The shape of the units to filter
+        :return: The filter of the units that are kept
+        """
+
+        # Split raw words of the step stream into one byte for each unit
+        units = math.prod(shape)
+        bit_generator = np.random.Philox(key=self._KEY, counter=step << 64)
+        filter_words = bit_generator.random_raw(-(-units // 8))
+        filter_bytes = filter_words.view(np.uint8)[:units]
+        filter_bytes = filter_bytes.reshape(shape)
+
+        # Keep the units with bytes at or above the threshold
+        dropout_filter = filter_bytes >= self._THRESHOLD
+
+        return dropout_filter
 
     def forward(self, input_layers: ndarray, **kwargs) -> ndarray:
         """
@@ -56,36 +109,87 @@ class Dropout(Layer):
 
         # Filter units only when in training
         if in_training:
-            # Filter random units with dropout
-            filter_values = self._generator.random(size=input_layers.shape)
-            dropout_filter = self._RATE < filter_values
-            filtered_inputs = np.where(dropout_filter, input_layers, 0)
-            output_layers = filtered_inputs / (1 - self._RATE)
-
-            # Save the filter for later use
-            self._dropout_filter = dropout_filter
+            output_layers = self.forward_train(input_layers)
         else:
+            output_layers = self.forward_eval(input_layers)
+
+        return output_layers
+
+    def forward_train(self, input_layers: ndarray) -> ndarray:
+        """
+        Forward propagate through this layer in model training. Outputs are
+        written to a buffer that is reused by the next training pass, or
+        over the inputs when the layer is in place.
+        :param input_layers: The inputs to be zeroed out
+        :return: The layer inputs after dropping units.
+        """
+
+        # Filter random units with the filter of a new training step
+        self._steps += 1
+        dropout_filter = self._draw_filter(
+            self._steps, input_layers.shape)
+
+        # Drop and rescale the units over the inputs or into the buffer
+        if self.in_place:
             output_layers = input_layers
+        else:
+            # Check that the output buffer can hold the inputs
+            output_buffer = self._output_buffer
+            if (output_buffer is None
+                    or output_buffer.shape[0] < input_layers.shape[0]
+                    or output_buffer.shape[1:] != input_layers.shape[1:]
+                    or output_buffer.dtype != input_layers.dtype):
+                self._configure(input_layers)
+            output_layers = self._output_buffer[:input_layers.shape[0]]
+        np.multiply(input_layers, dropout_filter, out=output_layers)
+        output_layers *= self._INV_KEEP
+
+        # Save only the step to redraw the same filter later
+        self._filter_step = self._steps
 
         return output_layers
 
+    def forward_eval(self, input_layers: ndarray) -> ndarray:
+        """
+        Forward propagate through this layer outside of model training.
+        :param input_layers: The inputs to be passed through
+        :return: The same inputs as no units are dropped
+        """
+        return input_layers
+
     def backward(self, output_grads: ndarray) -> ndarray:
         """
-        Backward propagate through this layer.
+        Backward propagate through this layer. The output gradients are
+        overwritten by the input gradients.
         :param output_grads: The loss gradients respecting the outputs
         :return: The partial loss derivatives with respect to layer inputs
         """
 
         # Check that forward propagation has been completed
-        dropout_filter = self._dropout_filter[:]  # None cannot be indexed
-        self._dropout_filter = None  # Erase the filter to prevent repeat use
+        if self._filter_step is None:
+            raise ValueError("Layer must be forward propagated in training.")
+        filter_step = self._filter_step
+        self._filter_step = None  # Erase the step to prevent repeat use
+
+        # Redraw the filter of the forward propagation step
+        dropout_filter = self._draw_filter(
+            filter_step, output_grads.shape)
 
-        # Calculate the loss gradients respecting the inputs
-        rescaled_grads = output_grads / (1 - self._RATE)
-        input_grads = np.where(dropout_filter, rescaled_grads, 0)
+        # Calculate the loss gradients respecting the inputs in place
+        input_grads = output_grads
+        input_grads *= dropout_filter
+        input_grads *= self._INV_KEEP
 
         return input_grads
 
+    def _backward_eval(self, output_grads: ndarray) -> ndarray:
+        """
+        Backward propagate through this layer when no units are dropped.
+        :param output_grads: The loss gradients respecting the outputs
+        :return: The same gradients as no units were dropped
+        """
+        return output_grads
+
     def serialize(self) -> dict:
         """
         Serialize the layer into a transmittable form.
@@ -4,6 +4,7 @@ Input layer to the machine learning model.
 
 __author__ = 'Dylan Warnecke'
 
+import numpy as np
 from numpy import ndarray
 from framework.layers import Layer
 
@@ -11,16 +12,19 @@ from framework.layers import Layer
 class Input(Layer):
     """
     Input layer for a neural network. These layers are used to verify model
-    input shapes and must and only come at the start of each network.
+    input shapes and must and only come at the start of each network. Integer
+    inputs, like raw image pixels, are converted to single precision here so
+    they can be stored compactly until they are used.
     """
 
     # Define the number of input layers created
     layers = 0
 
-    def __init__(self, input_shape: tuple):
+    def __init__(self, input_shape: tuple, scale: float = 1.0):
         """
         Create the input layer to the machine learning model.
         :param input_shape: The shape of the model inputs
+        :param scale: The factor the model inputs are multiplied by
         """
 
         # Call the super class initializer
@@ -38,6 +42,11 @@ class Input(Layer):
         # Define the model input shape
         self.INPUTS_SHAPE = input_shape
 
+        # Check and define the input scaling factor
+        if scale <= 0:
+            raise ValueError("Input scale must be positive.")
+        self._SCALE = scale
+
     def forward(self, model_inputs: ndarray, **kwargs) -> ndarray:
         """
         Forward propagate through this layer.
@@ -49,8 +58,14 @@ class Input(Layer):
         if model_inputs.shape[1:] != self.INPUTS_SHAPE:
             raise ValueError("Model input shape must be consistent.")
 
-        # Input layer performs no transformations
-        output_layers = model_inputs
+        # Convert integer inputs to single precision and scale the inputs
+        if np.issubdtype(model_inputs.dtype, np.floating):
+            output_layers = model_inputs
+            if self._SCALE != 1:
+                output_layers = output_layers * self._SCALE
+        else:
+            output_layers = model_inputs.astype(np.float32)
+            output_layers *= self._SCALE
 
         return output_layers
 
@@ -65,8 +80,10 @@ class Input(Layer):
         if output_grads.shape[1:] != self.INPUTS_SHAPE:
             raise ValueError("Model input shape must be consistent.")
 
-        # Input layer performs no transformations
+        # Rescale the gradients by the input scaling factor
         input_grads = output_grads
+        if self._SCALE != 1:
+            input_grads = input_grads * self._SCALE
 
         return input_grads
 
@@ -76,6 +93,10 @@ class Input(Layer):
         :return: The layer attributes and parameters
         """
 
-        layer = {'type': 'input', 'shape_in': self.INPUTS_SHAPE}
+        layer = {
+            'type': 'input',
+            'shape_in': self.INPUTS_SHAPE,
+            'scale': self._SCALE
+        }
 
         return layer
\ No newline at end of file
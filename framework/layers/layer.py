@@ -32,6 +32,22 @@ class Layer:
         """
         pass
 
+    def forward_train(self, layers_in: ndarray) -> ndarray:
+        """
+        Forward propagate through this layer in model training.
+        :param layers_in: The inputs to this model layer
+        :return: The calculated layer outputs given the current parameters
+        """
+        return self.forward(layers_in, in_training=True)
+
+    def forward_eval(self, layers_in: ndarray) -> ndarray:
+        """
+        Forward propagate through this layer outside of model training.
+        :param layers_in: The inputs to this model layer
+        :return: The calculated layer outputs given the current parameters
+        """
+        return self.forward(layers_in, in_training=False)
+
     def backward(self, gradients_out: ndarray) -> ndarray:
         """
         Backward propagate through this layer.
@@ -25,7 +25,7 @@ def _pool(inputs: ndarray, size: int) -> tuple:
     pools_shape = list(inputs.shape)
     pools_shape[1] = 1 + (inputs_height - 1) // size
     pools_shape[2] = 1 + (inputs_width - 1) // size
-    pools = np.empty(pools_shape)
+    pools = np.empty(pools_shape, inputs.dtype)
     masks = np.empty_like(inputs)
 
     # Pool by maximum values and save the masks
@@ -8,6 +8,8 @@ import json
 import numpy as np
 from numpy import ndarray
 from framework.layers.layer import Layer
+from framework.layers.dense import Dense
+from framework.layers.dropout import Dropout
 from framework.layers.input import Input
 from framework.losses.loss import Loss
 from framework.optimizers.optimizer import Optimizer
@@ -15,55 +17,38 @@ from framework.optimizers.optimizer import Optimizer
 generator = np.random.default_rng()
 
 
-def shuffle_data(examples: ndarray, labels: ndarray) -> tuple:
+def batch_indices(
+        indices: ndarray,
+        size: int,
+        drop_last: bool = False) -> tuple:
     """
-    Shuffle the examples and their labels in the same order.
-    :param examples: The examples to shuffle
-    :param labels: The labels of the examples to shuffle
-    :return: The examples and labels shuffled on the first axis
-    """
-
-    # Check that the first axis dimensions of the arguments match
-    if examples.shape[0] != labels.shape[0]:
-        raise IndexError("Examples and labels first dimension must match.")
-    quantity = examples.shape[0]
-
-    # Shuffle the examples and their labels
-    shuffling_indices = generator.permutation(quantity)
-    shuffled_examples = examples[shuffling_indices]
-    shuffled_labels = labels[shuffling_indices]
-
-    return shuffled_examples, shuffled_labels
-
-
-def batch_data(examples: ndarray, labels: ndarray, size: int) -> tuple:
-    """
-    Batch the examples and their respective labels into many groups.
-    :param examples: The examples to batch
-    :param labels: The labels of the examples to batch
+    Randomly batch the indices of many examples into many groups. The
+    indices are shuffled in place and the batches are views of them.
+    :param indices: The indices of the examples to batch
     :param size: The size of each batch
-    :return: The list of data batches
+    :param drop_last: If the final batch is dropped when it is not full
+    :return: The tuple of shuffled index batches
     """
 
     # Check that the batch size is positive
     if size < 1:
         raise ValueError("Batch size must be positive.")
-    
-    # Check that the first axis dimensions of the arguments match
-    if examples.shape[0] != labels.shape[0]:
-        raise IndexError("Examples and labels first dimension must match.")
-    quantity = examples.shape[0]
+    quantity = indices.shape[0]
 
     # Adjust the batching size if useful
     if quantity / 2 < size:
         size = quantity
 
-    # Batch the data together by the indices
-    example_batches = [examples[i:(i+size)] for i in range(0, quantity, size)]
-    label_batches = [labels[i:(i+size)] for i in range(0, quantity, size)]
+    # Shuffle the indices and batch the full batches as contiguous rows
+    generator.shuffle(indices)
+    full_batches = quantity // size
+    trimmed_quantity = full_batches * size
+    trimmed_indices = indices[:trimmed_quantity]
+    batches = tuple(trimmed_indices.reshape(full_batches, size))
 
-    # Zip the examples and their respective labels together
-    batches = tuple(zip(example_batches, label_batches))
+    # Keep the partial final batch unless it is dropped
+    if not drop_last and trimmed_quantity < quantity:
+        batches += (indices[trimmed_quantity:],)
 
     return batches
 
@@ -97,6 +82,23 @@ class Model:
                 raise ValueError("The first layer must be an input layer.")
         self.LAYERS = layers
 
+        # Drop units over dense outputs in place when they are new arrays,
+        # as the following layer then retains the only copy of the result
+        for prior_layer, layer in zip(layers, layers[1:]):
+            if (isinstance(prior_layer, Dense)
+                    and not prior_layer.RETAINS_OUTPUTS
+                    and isinstance(layer, Dropout)):
+                layer.in_place = True
+
+        # Bind the layer propagation methods of the training passes once
+        self._FORWARDS = tuple(layer.forward_train for layer in layers)
+        self._BACKWARDS = tuple(layer.backward for layer in layers[:0:-1])
+
+        # Bind the forward methods of the layers used outside of training
+        self._EVAL_FORWARDS = tuple(
+            layer.forward_eval for layer in layers
+            if not isinstance(layer, Dropout))
+
         # Define the loss function
         self._LOSS = loss
 
@@ -108,7 +110,7 @@ class Model:
             batch_examples: ndarray,
             batch_labels: ndarray,
             optimizer: Optimizer,
-            epoch: int) -> None:
+            epoch: int) -> float:
         """
         Complete an optimization step using a batch of examples and an
         optimization algorithm.
@@ -116,28 +118,35 @@ class Model:
         :param batch_labels: The truth labels of the batch examples
         :param optimizer: The optimizer algorithm to train the model
         :param epoch: The epoch number of the optimization step
+        :return: The loss of the batch before the optimization step
         """
 
         # Forward propagate through the model
         forward_outputs = batch_examples
-        for layer in self.LAYERS:
-            forward_outputs = layer.forward(forward_outputs, in_training=True)
+        for forward in self._FORWARDS:
+            forward_outputs = forward(forward_outputs)
+
+        # Calculate the batch loss from the training outputs
+        batch_loss = self._LOSS.calculate(forward_outputs, batch_labels)
 
-        # Backward propagate through the model
+        # Backward propagate through the model skipping the input layer
         backward_gradients = self._LOSS.gradate(forward_outputs, batch_labels)
-        for layer in reversed(self.LAYERS):
-            backward_gradients = layer.backward(backward_gradients)
+        for backward in self._BACKWARDS:
+            backward_gradients = backward(backward_gradients)
 
         # Update the layers with the parameter gradients
         optimizer.update(self, epoch)
 
+        return batch_loss
+
     def fit(
             self,
             examples: ndarray,
             labels: ndarray,
             batch_size: int,
             epochs: int,
-            optimizer: Optimizer) -> list:
+            optimizer: Optimizer,
+            drop_last: bool = False) -> list:
         """
         Optimize the model using batch gradient descent and the compilation
         parameters.
@@ -146,6 +155,7 @@ class Model:
         :param batch_size: The size of each batch in training
         :param epochs: The number of epochs to train the model for
         :param optimizer: The optimizer algorithm to train the model
+        :param drop_last: If each epoch drops its final partial batch
         :return: The training history of the model
         """
 
@@ -155,23 +165,38 @@ class Model:
         elif epochs < 1:
             raise ValueError("Epochs must be positive.")
 
+        # Check that the first axis dimensions of the data match
+        if examples.shape[0] != labels.shape[0]:
+            raise IndexError("Examples and labels first dimension must match.")
+        quantity = examples.shape[0]
+
         # Message that the model is being trained
         print(f"Fitting the model over {epochs} epochs:")
 
+        # Define the example indices reshuffled every epoch
+        shuffling_indices = np.arange(quantity)
+
         # Fit the model using batch descent
         training_history = []  # Define the training history
         for epoch in range(epochs):
-            # Randomly batch the examples together
-            random_examples, random_labels = shuffle_data(examples, labels)
-            batches = batch_data(random_examples, random_labels, batch_size)
-
-            # Optimize the model using the batch
-            for batch_examples, batch_labels in batches:
-                self._optimize(batch_examples, batch_labels, optimizer, epoch)
-
-            # Calculate and cache the current model metrics
-            outputs = self.predict(examples)
-            loss = self._LOSS.calculate(outputs, labels)
+            # Randomly batch the example indices together
+            batches = batch_indices(shuffling_indices, batch_size, drop_last)
+
+            # Optimize the model using the batch and accumulate the loss
+            loss_sum = 0.0
+            fit_quantity = 0
+            for indices in batches:
+                # Gather only the examples and labels of the batch
+                batch_examples = examples[indices]
+                batch_labels = labels[indices]
+
+                batch_loss = self._optimize(
+                    batch_examples, batch_labels, optimizer, epoch)
+                loss_sum += batch_loss * indices.size
+                fit_quantity += indices.size
+
+            # Cache the average batch loss as the epoch metric
+            loss = float(loss_sum / fit_quantity)
             training_history += [loss]
 
             # Message the current model performance
@@ -190,10 +215,10 @@ class Model:
         :return: The respective model predictions of the inputs
         """
 
-        # Forward propagate through model
+        # Forward propagate through model skipping the dropout layers
         forward_outputs = examples
-        for layer in self.LAYERS:
-            forward_outputs = layer.forward(forward_outputs, in_training=False)
+        for forward in self._EVAL_FORWARDS:
+            forward_outputs = forward(forward_outputs)
 
         return forward_outputs
 
@@ -20,15 +20,15 @@ from framework.utilities import make_one_hot
 if __name__ == '__main__':
     # Import and convert the training data
     training_set = pd.read_csv('training-digits.csv')
-    training_pixels = training_set.drop(columns='label').to_numpy()
+    training_pixels = training_set.drop(columns='label').to_numpy(np.uint8)
     training_digits = training_set.loc[:, 'label'].to_numpy()
-    training_digits = make_one_hot(training_digits, 10)
+    training_digits = make_one_hot(training_digits, 10).astype(np.float32)
     training_images = training_pixels.reshape((-1, 28, 28, 1))
 
     # Make the dense network model
     model = Model(
         CategoricalCrossEntropy(from_logits=True),
-        Input((28, 28, 1)),
+        Input((28, 28, 1), scale=1/255),
         Convolution(16, 3, True, Relu()),
         Dropout(0.1),
         MaxPool(2),